@@ -7,14 +7,21 @@
 # - Stylish UI: no emoji, minimal labels, keeps your chart style
 
 import os
+import time
 import base64
+from concurrent.futures import ThreadPoolExecutor
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    import orjson as _json
+except ImportError:  # optional speedup; stdlib json works the same here
+    import json as _json
 
 import streamlit as st
+import numpy as np
 import pandas as pd
-import matplotlib.pyplot as plt
-import matplotlib
-from matplotlib.patches import FancyBboxPatch
 
 
 # =========================
@@ -22,30 +29,73 @@ from matplotlib.patches import FancyBboxPatch
 # =========================
 TOKEN_URL = "https://accounts.spotify.com/api/token"
 API_BASE = "https://api.spotify.com/v1"
+_EMPTY = {}  # shared read-only fallback for missing response objects
 
 CLIENT_ID = st.secrets.get("SPOTIFY_CLIENT_ID", os.getenv("SPOTIFY_CLIENT_ID"))
 CLIENT_SECRET = st.secrets.get("SPOTIFY_CLIENT_SECRET", os.getenv("SPOTIFY_CLIENT_SECRET"))
+_BASIC_AUTH = (
+    "Basic " + base64.b64encode(f"{CLIENT_ID}:{CLIENT_SECRET}".encode()).decode()
+    if CLIENT_ID and CLIENT_SECRET
+    else None
+)
+
+
+@st.cache_resource
+def _http_session() -> requests.Session:
+    # Shared keep-alive session: pooled connections, retries on 5xx.
+    # Cached because Streamlit re-executes this script on every rerun.
+    session = requests.Session()
+    session.mount(
+        "https://",
+        HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=8,
+            # No 429 here: a rate limit falls straight through to Demo Data instead of hitting
+            # Spotify again. Retry-After is ignored so a long 503 wait cannot block the script.
+            max_retries=Retry(
+                total=3,
+                backoff_factor=0.3,
+                status_forcelist=(500, 502, 503),
+                respect_retry_after_header=False,
+                raise_on_status=False,
+            ),
+        ),
+    )
+    return session
+
+
+@st.cache_resource
+def _token_store() -> dict:
+    # client_id -> (access_token, expiry_epoch), shared across sessions
+    return {}
 
 
-@st.cache_data(ttl=3300)
 def get_app_token() -> str:
-    if not CLIENT_ID or not CLIENT_SECRET:
+    if not _BASIC_AUTH:
         raise RuntimeError("SPOTIFY_CLIENT_ID / SPOTIFY_CLIENT_SECRET is missing (check secrets.toml)")
 
-    auth = base64.b64encode(f"{CLIENT_ID}:{CLIENT_SECRET}".encode()).decode()
-    r = requests.post(
+    store = _token_store()
+    cached = store.get(CLIENT_ID)
+    if cached and time.time() < cached[1]:
+        return cached[0]
+
+    r = _http_session().post(
         TOKEN_URL,
-        headers={"Authorization": f"Basic {auth}"},
+        headers={"Authorization": _BASIC_AUTH},
         data={"grant_type": "client_credentials"},
         timeout=30,
     )
     if not r.ok:
         raise RuntimeError(f"Token error {r.status_code} {r.reason}: {r.text}")
-    return r.json()["access_token"]
+    payload = _json.loads(r.content)
+    token = payload["access_token"]
+    # refresh 60 s early so a token never expires mid-request
+    store[CLIENT_ID] = (token, time.time() + int(payload.get("expires_in", 3600)) - 60)
+    return token
 
 
 def spotify_get(path: str, access_token: str, params=None) -> dict:
-    r = requests.get(
+    r = _http_session().get(
         f"{API_BASE}{path}",
         headers={"Authorization": f"Bearer {access_token}", "Accept": "application/json"},
         params=params,
@@ -53,27 +103,30 @@ def spotify_get(path: str, access_token: str, params=None) -> dict:
     )
     if not r.ok:
         raise RuntimeError(f"{r.status_code} {r.reason}: {r.text}")
-    return r.json()
+    return _json.loads(r.content)
 
 
-def search_artists(name: str, access_token: str, market: str, limit: int = 5):
+@st.cache_data(ttl=600, show_spinner=False)
+def search_artists(name: str, _access_token: str, market: str, limit: int = 5):
     data = spotify_get(
         "/search",
-        access_token,
+        _access_token,
         params={"q": name, "type": "artist", "limit": int(limit), "market": market},
     )
     return data.get("artists", {}).get("items", [])
 
 
-def get_artist(artist_id: str, access_token: str) -> dict:
-    return spotify_get(f"/artists/{artist_id}", access_token)
+@st.cache_data(ttl=600, show_spinner=False)
+def get_artist(artist_id: str, _access_token: str) -> dict:
+    return spotify_get(f"/artists/{artist_id}", _access_token)
 
 
-def search_tracks_by_artist_name(artist_name: str, access_token: str, market: str, limit: int = 10):
+@st.cache_data(ttl=600, show_spinner=False)
+def search_tracks_by_artist_name(artist_name: str, _access_token: str, market: str, limit: int = 10):
     limit = max(1, min(20, int(limit)))
     data = spotify_get(
         "/search",
-        access_token,
+        _access_token,
         params={"q": f'artist:"{artist_name}"', "type": "track", "limit": limit, "market": market},
     )
     return data.get("tracks", {}).get("items", [])
@@ -81,48 +134,32 @@ def search_tracks_by_artist_name(artist_name: str, access_token: str, market: st
 
 def make_rank_index(n, top=100, floor=45):
     if n <= 1:
-        return [top]
-    out = []
-    for i in range(n):
-        t = i / float(max(1, n - 1))
-        v = int(round(top - (top - floor) * t))
-        out.append(v)
-    return out
+        return np.full(max(n, 1), top, dtype=int)
+    return np.round(np.linspace(top, floor, n)).astype(int)
 
 
 # =========================
 # Revenue simulator helpers
 # =========================
 def revenue_forecast_compound(spotify_streams, youtube_streams, spotify_rate, youtube_rate, growth_rate_pct, months):
-    data = []
-    cs = float(spotify_streams)
-    cy = float(youtube_streams)
+    months_arr = np.arange(1, int(months) + 1)
     g = 1.0 + (float(growth_rate_pct) / 100.0)
-    for m in range(1, int(months) + 1):
-        rev = (cs * float(spotify_rate)) + (cy * float(youtube_rate))
-        data.append({"Month": m, "Revenue": rev})
-        cs *= g
-        cy *= g
-    return pd.DataFrame(data)
+    base = (float(spotify_streams) * float(spotify_rate)) + (float(youtube_streams) * float(youtube_rate))
+    factors = np.power(g, months_arr - 1)
+    return pd.DataFrame({"Month": months_arr, "Revenue": base * factors})
 
 
 def revenue_forecast_linear(spotify_streams, youtube_streams, spotify_rate, youtube_rate, linear_add_spotify, linear_add_youtube, months):
-    data = []
-    cs = float(spotify_streams)
-    cy = float(youtube_streams)
-    for m in range(1, int(months) + 1):
-        rev = (cs * float(spotify_rate)) + (cy * float(youtube_rate))
-        data.append({"Month": m, "Revenue": rev})
-        cs += float(linear_add_spotify)
-        cy += float(linear_add_youtube)
-    return pd.DataFrame(data)
+    months_arr = np.arange(1, int(months) + 1)
+    base = (float(spotify_streams) * float(spotify_rate)) + (float(youtube_streams) * float(youtube_rate))
+    step = (float(linear_add_spotify) * float(spotify_rate)) + (float(linear_add_youtube) * float(youtube_rate))
+    return pd.DataFrame({"Month": months_arr, "Revenue": base + step * (months_arr - 1)})
 
 
-def reach_month(df, target_monthly_income):
-    for i, rev in enumerate(df["Revenue"], start=1):
-        if float(rev) >= float(target_monthly_income):
-            return i
-    return None
+def reach_month(rev_arr, target_monthly_income):
+    # Revenue must be non-decreasing (growth and linear adds are >= 0 in the UI).
+    i = int(np.searchsorted(rev_arr, float(target_monthly_income), side="left"))
+    return i + 1 if i < rev_arr.size else None
 
 
 def required_growth_rate_to_reach(r0, target, months):
@@ -169,23 +206,17 @@ def estimate_streams_from_artist(popularity, followers):
     followers = max(0, int(followers))
     popularity = max(0, min(100, int(popularity)))
 
-    base_ratio = 0.08 + (popularity / 100.0) * 0.10
-    spotify_streams = max(5000, int(followers * base_ratio))
-
-    yt_ratio = 0.40 + (popularity / 100.0) * 0.40
-    youtube_streams = max(0, int(spotify_streams * yt_ratio))
+    spotify_streams = max(5000, int(followers * (0.08 + popularity * 0.001)))
+    youtube_streams = max(0, int(spotify_streams * (0.40 + popularity * 0.004)))
     return spotify_streams, youtube_streams
 
 
-def sync_revenue_defaults_from_selected_artist():
-    sel = st.session_state.get("selected_artist")
-    if not sel:
+def sync_revenue_defaults_from_selected_artist(artist_key):
+    if not artist_key or st.session_state.get("_last_artist_key_for_revenue") == artist_key:
         return
 
-    artist_key = sel.get("key")
-    if not artist_key:
-        return
-    if st.session_state.get("_last_artist_key_for_revenue") == artist_key:
+    sel = st.session_state.get("selected_artist")
+    if not sel:
         return
 
     pop = int(sel.get("popularity", 60))
@@ -209,70 +240,45 @@ def sync_revenue_defaults_from_selected_artist():
 # =========================
 # Chart (keep your style)
 # =========================
-def soft_horizontal_bar(ax, data: pd.DataFrame):
-    base = (110 / 255, 231 / 255, 183 / 255, 0.18)
-    strong = (110 / 255, 231 / 255, 183 / 255, 0.55)
-
-    labels = data["label"].tolist()[::-1]
-    values = data["value"].tolist()[::-1]
-
-    vmax = max(values) if values else 0
-    ax.set_xlim(0, vmax * 1.15 if vmax > 0 else 1)
-    ax.set_ylim(-0.6, len(values) - 0.4)
-
-    ax.set_xticks([])
-    ax.set_yticks(range(len(labels)))
-    ax.set_yticklabels(labels)
-
-    for spine in ax.spines.values():
-        spine.set_visible(False)
-
-    height = 0.56
-    for i, v in enumerate(values):
-        color = strong if (vmax > 0 and v == vmax) else base
-        patch = FancyBboxPatch(
-            (0, i - height / 2),
-            v,
-            height,
-            boxstyle="round,pad=0.02,rounding_size=10",
-            linewidth=0,
-            facecolor=color,
-        )
-        ax.add_patch(patch)
-
-        if vmax > 0 and v == vmax:
-            ax.text(
-                v + vmax * 0.03,
-                i,
-                f"{int(v):,}",
-                va="center",
-                ha="left",
-                fontsize=18,
-                color=(110 / 255, 231 / 255, 183 / 255, 0.85),
-                weight="bold",
-            )
+def soft_bar_chart(data: pd.DataFrame):
+    # Rendered client-side by Vega-Lite; altair is imported on first chart render only
+    import altair as alt
+
+    vmax = float(data["value"].max()) if len(data) else 0.0
+    is_max = alt.datum.value == vmax
+
+    base = alt.Chart(data).encode(
+        y=alt.Y(
+            "label:N",
+            sort=None,
+            title=None,
+            axis=alt.Axis(domain=False, ticks=False, labelColor="#b9c2cc", labelFontSize=13, labelPadding=8),
+        ),
+        x=alt.X("value:Q", axis=None, scale=alt.Scale(domain=[0, vmax * 1.15 if vmax > 0 else 1])),
+    )
+    bars = base.mark_bar(cornerRadius=10, color="#6ee7b7", height=alt.RelativeBandSize(0.56)).encode(
+        opacity=alt.condition(is_max, alt.value(0.55), alt.value(0.18)) if vmax > 0 else alt.value(0.18)
+    )
+    chart = bars
+    if vmax > 0:
+        label = base.transform_filter(is_max).mark_text(
+            align="left", dx=10, fontSize=18, fontWeight="bold", color="#6ee7b7", opacity=0.85
+        ).encode(text=alt.Text("value:Q", format=","))
+        chart = bars + label
+
+    return chart.properties(height=240).configure_view(stroke=None)
+
+
+@st.cache_data(max_entries=32, show_spinner=False)
+def bar_chart_spec(labels: tuple, values: tuple) -> dict:
+    # Serialized Vega-Lite spec; skips Altair chart building + schema validation on reruns
+    return soft_bar_chart(pd.DataFrame({"label": labels, "value": values})).to_dict()
 
 
 # =========================
 # UI setup (stylish, no emoji)
 # =========================
-matplotlib.rcParams["font.family"] = "Hiragino Sans"
-matplotlib.rcParams.update(
-    {
-        "figure.facecolor": "none",
-        "axes.facecolor": "none",
-        "axes.edgecolor": "none",
-        "axes.labelcolor": "#cfd6dd",
-        "xtick.color": "#b9c2cc",
-        "ytick.color": "#b9c2cc",
-        "text.color": "#d7dee6",
-    }
-)
-
-st.set_page_config(page_title="Music Analyzer", page_icon="", layout="wide")
-
-st.markdown(
-    """
+_CSS = """
 <style>
 :root{
   --panel: rgba(255,255,255,0.03);
@@ -285,7 +291,6 @@ st.markdown(
 h1 {font-size: 2.0rem; margin: 0 0 .35rem;}
 h2 {font-size: 1.35rem; margin-top: 1.15rem; margin-bottom: .55rem;}
 h3 {font-size: 1.05rem; margin-top: .8rem; margin-bottom: .4rem;}
-.small {opacity: .72; font-size: .92rem; line-height: 1.6;}
 
 .badges{display:flex; gap:8px; flex-wrap:wrap; margin: 0 0 10px;}
 .badge{
@@ -326,19 +331,19 @@ h3 {font-size: 1.05rem; margin-top: .8rem; margin-bottom: .4rem;}
 .card-scope [data-testid="stMetricValue"]{font-size: 1.35rem;}
 .card-scope [data-testid="stMetricLabel"]{opacity: .75;}
 </style>
-""",
-    unsafe_allow_html=True,
-)
+"""
 
-st.markdown(
-    '<div class="badges"><span class="badge">Music Analyzer</span><span class="badge ghost">Stable</span></div>',
-    unsafe_allow_html=True,
-)
+# Adjacent static HTML is pre-joined so each group is a single element
+_BADGES_HTML = '<div class="badges"><span class="badge">Music Analyzer</span><span class="badge ghost">Stable</span></div>'
+_PAGE_HEAD_HTML = _CSS + _BADGES_HTML
+_SPACER_HTML = '<div style="height: 12px;"></div>'
+_HEADER_HTML = _SPACER_HTML + '<div class="card-scope">'
+
+st.set_page_config(page_title="Music Analyzer", page_icon="", layout="wide")
+
+st.markdown(_PAGE_HEAD_HTML, unsafe_allow_html=True)
 st.title("Artist Insights + Revenue Simulator")
 st.caption("Spotify API (client credentials) + revenue simulation. No login required.")
-st.markdown('<div style="height: 12px;"></div>', unsafe_allow_html=True)
-
-st.markdown('<div class="card-scope">', unsafe_allow_html=True)
 
 # =========================
 # Sidebar inputs
@@ -353,41 +358,47 @@ with st.sidebar:
 # =========================
 # Demo data
 # =========================
-def demo_artist_data(name: str):
-    artist = {
-        "name": name if name else "Sample Artist",
-        "popularity": 72,
-        "followers": 1234567,
-        "genres": ["electronic", "hip hop", "experimental"],
-        "image_url": None,
-        "id": "demo",
+_DEMO_SERIES = pd.DataFrame(
+    {"label": ["1", "2", "3", "4", "5"], "value": np.array([100, 86, 72, 65, 54], dtype=np.int16)}
+)
+_TOP_TRACKS = pd.DataFrame(
+    {
+        "track": ["Track A", "Track B", "Track C", "Track D", "Track E"],
+        "streams_index": np.array([100, 86, 72, 65, 54], dtype=np.int16),
+        "duration_sec": np.array([188, 201, 214, 179, 232], dtype=np.int16),
     }
-    series = pd.DataFrame(
-        [{"label": "1", "value": 100}, {"label": "2", "value": 86}, {"label": "3", "value": 72}, {"label": "4", "value": 65}, {"label": "5", "value": 54}]
-    )
-    top_tracks = pd.DataFrame(
-        [
-            {"track": "Track A", "streams_index": 100, "duration_sec": 188},
-            {"track": "Track B", "streams_index": 86, "duration_sec": 201},
-            {"track": "Track C", "streams_index": 72, "duration_sec": 214},
-            {"track": "Track D", "streams_index": 65, "duration_sec": 179},
-            {"track": "Track E", "streams_index": 54, "duration_sec": 232},
-        ]
-    )
-    return artist, top_tracks, series
+)
+
+
+_DEMO_FOLLOWERS = 1234567
+_DEMO_ARTIST_TEMPLATE = {
+    "popularity": 72,
+    "followers": _DEMO_FOLLOWERS,
+    "followers_str": f"{_DEMO_FOLLOWERS:,}",
+    "genres": ("electronic", "hip hop", "experimental"),
+    "image_url": None,
+    "id": "demo",
+}
+
+
+def demo_artist_data(name: str):
+    # Shallow copy of the template; the frames are shared module constants
+    return {**_DEMO_ARTIST_TEMPLATE, "name": name or "Sample Artist"}, _TOP_TRACKS, _DEMO_SERIES
 
 
 # =========================
 # Guard
 # =========================
 if not artist_query:
+    # No card-scope wrapper on the Start page; only the spacer is needed
+    st.markdown(_SPACER_HTML, unsafe_allow_html=True)
     with st.container(border=True):
         st.markdown("### Start")
         st.write("Enter an artist name in the sidebar.")
-        st.markdown('<div class="small">Spotify API mode fetches real metadata. Demo Data is always available.</div>', unsafe_allow_html=True)
-    st.markdown("</div>", unsafe_allow_html=True)
+        st.caption("Spotify API mode fetches real metadata. Demo Data is always available.")
     st.stop()
 
+st.markdown(_HEADER_HTML, unsafe_allow_html=True)
 
 # =========================
 # Data fetch
@@ -407,39 +418,42 @@ try:
             raise RuntimeError("Artist not found")
 
         artist_id = candidates[0]["id"]
-        artist_full = get_artist(artist_id, token)
-        debug_log.append("step: /artists/{id} ok")
-
-        images = artist_full.get("images") or candidates[0].get("images") or []
-        image_url = images[0]["url"] if images else None
+        # /artists/{id} and the track search only need the first candidate; run them together
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            artist_future = pool.submit(get_artist, artist_id, token)
+            tracks_future = pool.submit(search_tracks_by_artist_name, candidates[0].get("name", ""), token, market, limit=10)
+            artist_full = artist_future.result()
+            debug_log.append("step: /artists/{id} ok")
+            tracks = tracks_future.result()
+            debug_log.append("step: /search track ok")
+
+        image_url = next(
+            (i["url"] for i in (artist_full.get("images") or candidates[0].get("images") or ()) if i), None
+        )
+        followers_total = int((artist_full.get("followers") or _EMPTY).get("total", 0) or 0)
 
         artist = {
             "name": artist_full.get("name", candidates[0].get("name", "")),
             "popularity": int(artist_full.get("popularity", 0) or 0),
-            "followers": int(((artist_full.get("followers") or {}).get("total", 0)) or 0),
+            "followers": followers_total,
+            "followers_str": f"{followers_total:,}",
             "genres": artist_full.get("genres", []) or [],
             "image_url": image_url,
             "id": artist_id,
         }
 
-        tracks = search_tracks_by_artist_name(artist["name"], token, market, limit=10)
-        debug_log.append("step: /search track ok")
-
         idx = make_rank_index(len(tracks), top=100, floor=45)
+        streams_idx = idx[: len(tracks)]
+        durations = np.fromiter(
+            ((t.get("duration_ms") or 0) // 1000 for t in tracks), dtype=np.int64, count=len(tracks)
+        )
         top_tracks = pd.DataFrame(
-            [
-                {
-                    "track": t.get("name", ""),
-                    "streams_index": int(idx[i]) if i < len(idx) else 0,
-                    "duration_sec": int((t.get("duration_ms") or 0) / 1000),
-                }
-                for i, t in enumerate(tracks)
-            ]
+            {"track": [t.get("name", "") for t in tracks], "streams_index": streams_idx, "duration_sec": durations}
         )
 
         series = pd.DataFrame(
-            [{"label": str(i + 1), "value": int(top_tracks.loc[i, "streams_index"])} for i in range(len(top_tracks))]
-        ) if len(top_tracks) else pd.DataFrame([{"label": "1", "value": 1}])
+            {"label": [str(i + 1) for i in range(len(streams_idx))], "value": streams_idx}
+        ) if len(streams_idx) else pd.DataFrame([{"label": "1", "value": 1}])
 
     else:
         artist, top_tracks, series = demo_artist_data(artist_query)
@@ -457,15 +471,17 @@ if debug and debug_log:
             st.write(line)
 
 # Save selection for revenue defaults
+artist_key = f"{artist.get('id','')}|{artist.get('followers',0)}|{artist.get('popularity',0)}"
 st.session_state["selected_artist"] = {
     "name": artist["name"],
     "popularity": artist.get("popularity", 0),
     "followers": artist.get("followers", 0),
+    "followers_str": artist.get("followers_str", "0"),
     "genres": artist.get("genres", []),
     "image_url": artist.get("image_url"),
-    "key": f"{artist.get('id','')}|{artist.get('followers',0)}|{artist.get('popularity',0)}",
+    "key": artist_key,
 }
-sync_revenue_defaults_from_selected_artist()
+sync_revenue_defaults_from_selected_artist(artist_key)
 
 # =========================
 # Tabs
@@ -488,23 +504,31 @@ with tab1:
 
             m1, m2 = st.columns(2)
             m1.metric("Popularity", int(artist.get("popularity", 0)))
-            m2.metric("Followers", f"{int(artist.get('followers', 0)):,}")
+            m2.metric("Followers", artist.get("followers_str", "0"))
 
             st.markdown("**Genres**")
             st.write(", ".join(artist.get("genres", [])) if artist.get("genres") else "-")
-            st.markdown('<div class="small">Spotify Web API does not provide stream counts. Track index is relative.</div>', unsafe_allow_html=True)
+            st.caption("Spotify Web API does not provide stream counts. Track index is relative.")
 
         st.subheader("Tracks")
         with st.container(border=True):
-            st.dataframe(top_tracks[["track", "streams_index", "duration_sec"]], use_container_width=True, hide_index=True)
+            # top_tracks is always built with exactly these columns, so no projection is needed
+            st.dataframe(
+                top_tracks,
+                width="stretch",
+                hide_index=True,
+                column_config={
+                    "track": st.column_config.TextColumn("track"),
+                    "streams_index": st.column_config.ProgressColumn("streams_index", min_value=0, max_value=100, format="%d"),
+                    "duration_sec": st.column_config.NumberColumn("duration_sec", format="%d s"),
+                },
+            )
 
     with col_right:
         st.subheader("Chart")
         with st.container(border=True):
-            fig, ax = plt.subplots(figsize=(7.2, 4.2))
-            soft_horizontal_bar(ax, series)
-            fig.tight_layout()
-            st.pyplot(fig, clear_figure=True)
+            spec = bar_chart_spec(tuple(series["label"]), tuple(series["value"].tolist()))
+            st.vega_lite_chart(spec, width="stretch")
 
 with tab2:
     sel = st.session_state.get("selected_artist")
@@ -519,8 +543,8 @@ with tab2:
                 st.markdown(f"### {sel.get('name')}")
                 sm1, sm2 = st.columns(2)
                 sm1.metric("Popularity", int(sel.get("popularity", 0)))
-                sm2.metric("Followers", f"{int(sel.get('followers', 0)):,}")
-                st.markdown('<div class="small">Defaults are estimated from artist metadata. Adjust freely.</div>', unsafe_allow_html=True)
+                sm2.metric("Followers", sel.get("followers_str", "0"))
+                st.caption("Defaults are estimated from artist metadata. Adjust freely.")
 
     with st.container(border=True):
         r1, r2 = st.columns(2, vertical_alignment="top")
@@ -588,7 +612,8 @@ with tab2:
     df = revenue_forecast_compound(spotify_streams, youtube_streams, spotify_rate, youtube_rate, growth_rate, int(months))
     df_lin = revenue_forecast_linear(spotify_streams, youtube_streams, spotify_rate, youtube_rate, linear_add_spotify, linear_add_youtube, int(months))
 
-    reach = reach_month(df, target_monthly_income)
+    rev_arr = df["Revenue"].to_numpy()
+    reach = reach_month(rev_arr, target_monthly_income)
     req_g, req_note = required_growth_rate_to_reach(monthly_total, float(target_monthly_income), int(months))
     rev_req = reverse_required_streams(spotify_streams, youtube_streams, spotify_rate, youtube_rate, target_monthly_income)
 
@@ -612,7 +637,7 @@ with tab2:
         if reach is not None:
             st.success(f"Estimated to reach target in month {reach}.")
         else:
-            last_rev = float(df["Revenue"].iloc[-1])
+            last_rev = float(rev_arr[-1])
             st.warning("Target not reached within the selected duration.")
             st.caption(f"Last month: {int(last_rev):,} JPY (Target: {int(target_monthly_income):,} JPY)")
 
@@ -633,19 +658,19 @@ with tab2:
     with right:
         st.subheader("Forecast")
         with st.container(border=True):
-            fig, ax = plt.subplots()
-            ax.plot(df["Month"], df["Revenue"], label="Compound")
-            ax.plot(df_lin["Month"], df_lin["Revenue"], label="Linear")
-            ax.set_xlabel("Month")
-            ax.set_ylabel("Revenue (JPY)")
-            ax.grid(True, alpha=0.2)
-            ax.legend()
-            st.pyplot(fig, clear_figure=True)
+            chart_df = pd.DataFrame(
+                {"Month": df["Month"], "Compound": df["Revenue"].to_numpy(), "Linear": df_lin["Revenue"].to_numpy()}
+            ).set_index("Month")
+            st.line_chart(chart_df, x_label="Month", y_label="Revenue (JPY)")
 
         with st.expander("Data"):
             st.dataframe(df, use_container_width=True)
 
-        csv_bytes = df.to_csv(index=False).encode("utf-8-sig")
-        st.download_button("Download CSV", data=csv_bytes, file_name="revenue_forecast.csv", mime="text/csv")
+        st.download_button(
+            "Download CSV",
+            data=lambda: df.to_csv(index=False).encode("utf-8-sig"),
+            file_name="revenue_forecast.csv",
+            mime="text/csv",
+        )
 
 st.markdown("</div>", unsafe_allow_html=True)
\ No newline at end of file